@@ -1,13 +1,92 @@
 """YNAB API client for making authenticated requests."""
 
-from typing import Literal
+import asyncio
+import functools
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any, Literal
 
 import httpx
+import ijson
+import msgspec
+import orjson
+from ynab_mcp.models import Account, AccountsResponse, Budget, BudgetsResponse
+
+# Category fields kept by get_categories unless the caller asks for others
+CATEGORY_FIELDS = ("id", "name", "budgeted", "activity", "balance")
+
+
+# Bound once so the hot decode path does not look up orjson.loads per call
+_loads = orjson.loads
+
+# Decoders for endpoints with a typed response model
+_budgets_decoder = msgspec.json.Decoder(BudgetsResponse)
+_accounts_decoder = msgspec.json.Decoder(AccountsResponse)
+
+# Responses smaller than this can only hold an empty list plus the envelope
+_EMPTY_BODY_MAX = 64
+
+
+def _is_empty(response: httpx.Response, key: bytes) -> bool:
+    """Check whether a response is an empty list without decoding it.
+
+    Args:
+        response: A successful response from the YNAB API
+        key: The JSON key holding the list, e.g. b"budgets"
+
+    Returns:
+        True if the body is tiny and contains ``"<key>":[]``
+    """
+    content = response.content
+    return len(content) < _EMPTY_BODY_MAX and b'"%s":[]' % key in content
+
+
+def _decode(response: httpx.Response) -> dict:
+    """Decode a YNAB API response body.
+
+    Parses the raw bytes with orjson rather than ``response.json()``, which
+    skips the intermediate UTF-8 decode to ``str`` and is considerably faster
+    on large payloads.
+
+    Args:
+        response: A successful response from the YNAB API
+
+    Returns:
+        The decoded JSON document
+    """
+    return _loads(response.content)
+
+
+def _parse_budgets(response: httpx.Response) -> list[Budget]:
+    """Parse the budget list out of a GET /budgets response."""
+    if _is_empty(response, b"budgets"):
+        return []
+    return _budgets_decoder.decode(response.content).data.budgets
+
+
+def _parse_categories(response: httpx.Response, fields: tuple[str, ...]) -> list[dict]:
+    """Parse a GET /budgets/{budget_id}/categories response into a flat list."""
+    if _is_empty(response, b"category_groups"):
+        return []
+    data = _decode(response)
+
+    # Flatten category groups into a flat list, projecting each category
+    # onto the requested fields plus its group name
+    return [
+        {"category_group_name": group["name"], **{f: category.get(f) for f in fields}}
+        for group in data["data"]["category_groups"]
+        for category in group.get("categories", [])
+    ]
 
 
 class YNABClient:
     """Client for interacting with the YNAB API."""
 
+    # Whether get_accounts asks only for changes since its last call for a
+    # budget. Switched off when recording or replaying API responses, where
+    # the requests sent must not depend on what the process fetched before.
+    delta_requests = True
+
     def __init__(self, api_token: str):
         """Initialize the YNAB API client.
 
@@ -16,43 +95,216 @@ class YNABClient:
         """
         self.api_token = api_token
         self.base_url = "https://api.ynab.com/v1"
+
+        # Build request URLs once rather than formatting and parsing them per call
+        self._budgets_url = httpx.URL(f"{self.base_url}/budgets")
+        self._budget_url = functools.lru_cache(maxsize=64)(self._build_budget_url)
+
+        # Every request goes to the same host, so keep a warm HTTP/2 connection
+        # pool around for the lifetime of the client instead of paying a
+        # TCP + TLS handshake on each call.
         self.client = httpx.AsyncClient(
+            http2=True,
             headers={"Authorization": f"Bearer {api_token}"},
-            timeout=10.0,
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=100,
+                keepalive_expiry=60.0,
+            ),
         )
 
-    async def get_budgets(self) -> list[dict]:
-        """Retrieve all budgets for the authenticated user.
+        # Short-lived cache for slow-changing data, keyed by request
+        self._cache: dict[str, tuple[float, Any]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+        # Last ETag and parsed result per request, for conditional GETs
+        self._etags: dict[str, str] = {}
+        self._last: dict[str, Any] = {}
+
+        # Last server_knowledge and accounts (by ID) per budget, for delta requests
+        self._account_knowledge: dict[str, tuple[int, dict[str, Account]]] = {}
+
+    def _build_budget_url(self, budget_id: str, suffix: str) -> httpx.URL:
+        """Build the URL for a budget sub-resource, e.g. its accounts."""
+        return httpx.URL(f"{self.base_url}/budgets/{budget_id}/{suffix}")
+
+    async def _cached(
+        self,
+        key: str,
+        ttl: float,
+        coro_factory: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Return a cached value, refreshing it once it is older than ``ttl``.
+
+        Concurrent callers for the same key share a lock so only one of them
+        hits the API when the entry is missing or stale.
+
+        Args:
+            key: Cache key identifying the request
+            ttl: Maximum age of the cached value in seconds
+            coro_factory: Callable producing the coroutine that fetches a fresh value
+
+        Returns:
+            The cached or freshly fetched value
+        """
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if (entry := self._cache.get(key)) is not None:
+                timestamp, value = entry
+                if time.monotonic() - timestamp < ttl:
+                    return value
+
+            value = await coro_factory()
+            self._cache[key] = (time.monotonic(), value)
+            return value
+
+    async def _conditional_get(
+        self,
+        url: httpx.URL,
+        key: str,
+        parse: Callable[[httpx.Response], Any],
+    ) -> Any:
+        """GET a URL, reusing the last parsed result if it has not changed.
+
+        Sends ``If-None-Match`` with the ETag of the previous response, and on
+        a 304 returns the result parsed from that response instead of
+        downloading and decoding the body again.
+
+        Args:
+            url: URL to request
+            key: Key identifying the request and how its result is parsed
+            parse: Turns a successful response into the result
 
         Returns:
-            List of budget dictionaries containing budget summary information
+            The parsed (possibly reused) result
 
         Raises:
             httpx.HTTPStatusError: If the API returns an error status code
             httpx.RequestError: If there's a network or connection error
         """
-        response = await self.client.get(f"{self.base_url}/budgets")
+        headers = {"If-None-Match": etag} if (etag := self._etags.get(key)) else None
+        response = await self.client.get(url, headers=headers)
+        if response.status_code == 304 and key in self._last:
+            return self._last[key]
         response.raise_for_status()
-        data = response.json()
-        return data["data"]["budgets"]
 
-    async def get_accounts(self, budget_id: str) -> list[dict]:
+        result = parse(response)
+        if etag := response.headers.get("etag"):
+            self._etags[key] = etag
+            self._last[key] = result
+        return result
+
+    async def get_budgets(self) -> list[Budget]:
+        """Retrieve all budgets for the authenticated user.
+
+        Results are cached for 60 seconds.
+
+        Returns:
+            List of budgets containing budget summary information
+
+        Raises:
+            httpx.HTTPStatusError: If the API returns an error status code
+            httpx.RequestError: If there's a network or connection error
+        """
+        return await self._cached("budgets", 60.0, self._fetch_budgets)
+
+    async def _fetch_budgets(self) -> list[Budget]:
+        """Fetch the budget list from the API, bypassing the cache."""
+        return await self._conditional_get(self._budgets_url, "budgets", _parse_budgets)
+
+    async def get_accounts(self, budget_id: str) -> list[Account]:
         """Retrieve all accounts for a specific budget.
 
+        After the first call for a budget, only accounts changed since then
+        are requested (using YNAB's server_knowledge delta requests) and
+        merged into the previously fetched list.
+
         Args:
             budget_id: The ID of the budget to get accounts from
 
         Returns:
-            List of account dictionaries containing account information
+            List of accounts containing account information
 
         Raises:
             httpx.HTTPStatusError: If the API returns an error status code
             httpx.RequestError: If there's a network or connection error
         """
-        response = await self.client.get(f"{self.base_url}/budgets/{budget_id}/accounts")
-        response.raise_for_status()
-        data = response.json()
-        return data["data"]["accounts"]
+        url = self._budget_url(budget_id, "accounts")
+        known = self._account_knowledge.get(budget_id) if self.delta_requests else None
+        if known is None:
+            response = await self.client.get(url)
+            response.raise_for_status()
+            if _is_empty(response, b"accounts"):
+                return []
+            accounts = {}
+        else:
+            response = await self.client.get(url, params={"last_knowledge_of_server": known[0]})
+            response.raise_for_status()
+            accounts = dict(known[1])
+
+        # Apply the (full or delta) response on top of what we already had
+        data = _accounts_decoder.decode(response.content).data
+        for account in data.accounts:
+            if account.deleted:
+                accounts.pop(account.id, None)
+            else:
+                accounts[account.id] = account
+
+        if data.server_knowledge is not None:
+            self._account_knowledge[budget_id] = (data.server_knowledge, accounts)
+        return list(accounts.values())
+
+    async def get_all_accounts(self, max_concurrency: int = 8) -> list[tuple[Budget, list[Account]]]:
+        """Retrieve the accounts of every budget.
+
+        Account lists are fetched concurrently (at most ``max_concurrency`` at
+        a time) over the shared connection pool, so the total cost is close to
+        a single round trip rather than one per budget.
+
+        Args:
+            max_concurrency: Maximum number of account requests in flight
+
+        Returns:
+            List of (budget, accounts) pairs, in the
+            order the budgets are returned by the API
+
+        Raises:
+            httpx.HTTPStatusError: If the API returns an error status code
+            httpx.RequestError: If there's a network or connection error
+        """
+        budgets = await self.get_budgets()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(budget: Budget) -> tuple[Budget, list[Account]]:
+            async with semaphore:
+                return budget, await self.get_accounts(budget.id)
+
+        return await asyncio.gather(*(fetch(budget) for budget in budgets))
+
+    async def get_budget_overview(self, budget_id: str) -> tuple[Budget | None, list[Account]]:
+        """Retrieve a budget's summary together with its accounts.
+
+        The budget list and the account list are fetched concurrently, so the
+        combined read costs roughly one round trip instead of two.
+
+        Args:
+            budget_id: The ID of the budget to get the overview for
+
+        Returns:
+            Tuple of the matching budget (None if the budget list
+            has no entry with this ID, e.g. for "last-used") and its accounts
+
+        Raises:
+            httpx.HTTPStatusError: If the API returns an error status code
+            httpx.RequestError: If there's a network or connection error
+        """
+        budgets, accounts = await asyncio.gather(
+            self.get_budgets(),
+            self.get_accounts(budget_id),
+        )
+        budget = next((b for b in budgets if b.id == budget_id), None)
+        return budget, accounts
 
     async def get_transactions(
         self,
@@ -72,26 +324,69 @@ class YNABClient:
             httpx.HTTPStatusError: If the API returns an error status code
             httpx.RequestError: If there's a network or connection error
         """
-        url = f"{self.base_url}/budgets/{budget_id}/transactions"
+        return [txn async for txn in self.iter_transactions(budget_id, transaction_type)]
+
+    async def iter_transactions(
+        self,
+        budget_id: str,
+        transaction_type: Literal["uncategorized", "unapproved"] | None = None
+    ) -> AsyncIterator[dict]:
+        """Stream transactions for a specific budget one at a time.
+
+        The response body is parsed incrementally as it arrives, so the raw
+        payload is never buffered in full. Prefer this over get_transactions
+        for large budgets.
+
+        Args:
+            budget_id: The ID of the budget (supports "last-used" or "default")
+            transaction_type: Optional filter - "uncategorized" or "unapproved"
+
+        Yields:
+            Transaction dictionaries containing transaction details
+
+        Raises:
+            httpx.HTTPStatusError: If the API returns an error status code
+            httpx.RequestError: If there's a network or connection error
+        """
+        url = self._budget_url(budget_id, "transactions")
 
         # Build query parameters
         params = {}
         if transaction_type is not None:
             params["type"] = transaction_type
 
-        response = await self.client.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        return data["data"]["transactions"]
+        async with self.client.stream("GET", url, params=params) as response:
+            response.raise_for_status()
+
+            # Push chunks into ijson and drain whatever items they completed
+            transactions = ijson.sendable_list()
+            parser = ijson.items_coro(
+                transactions, "data.transactions.item", use_float=True
+            )
+            async for chunk in response.aiter_bytes():
+                parser.send(chunk)
+                for txn in transactions:
+                    yield txn
+                del transactions[:]
+            parser.close()
+            for txn in transactions:
+                yield txn
 
-    async def get_categories(self, budget_id: str) -> list[dict]:
+    async def get_categories(
+        self,
+        budget_id: str,
+        fields: tuple[str, ...] = CATEGORY_FIELDS,
+    ) -> list[dict]:
         """Retrieve all categories for a specific budget.
 
         Categories are returned flattened from their category groups, with
-        the group name attached to each category.
+        the group name attached to each category. Only the requested fields
+        are kept, so the rest of the (fairly large) category payload is not
+        retained. Results are cached per budget for 30 seconds.
 
         Args:
             budget_id: The ID of the budget to get categories from
+            fields: Category fields to keep; missing fields are set to None
 
         Returns:
             List of category dictionaries with category_group_name added
@@ -100,17 +395,19 @@ class YNABClient:
             httpx.HTTPStatusError: If the API returns an error status code
             httpx.RequestError: If there's a network or connection error
         """
-        response = await self.client.get(f"{self.base_url}/budgets/{budget_id}/categories")
-        response.raise_for_status()
-        data = response.json()
-
-        # Flatten category groups into a flat list with group name on each category
-        categories = []
-        for group in data["data"]["category_groups"]:
-            for category in group.get("categories", []):
-                category["category_group_name"] = group["name"]
-                categories.append(category)
-        return categories
+        return await self._cached(
+            f"categories:{budget_id}:{','.join(fields)}",
+            30.0,
+            lambda: self._fetch_categories(budget_id, fields),
+        )
+
+    async def _fetch_categories(self, budget_id: str, fields: tuple[str, ...]) -> list[dict]:
+        """Fetch the flattened category list from the API, bypassing the cache."""
+        return await self._conditional_get(
+            self._budget_url(budget_id, "categories"),
+            f"categories:{budget_id}:{','.join(fields)}",
+            functools.partial(_parse_categories, fields=fields),
+        )
 
     async def close(self):
         """Close the HTTP client and cleanup resources."""
@@ -0,0 +1,57 @@
+"""Typed YNAB API response models.
+
+Only the fields the server actually uses (for display or for merging delta
+responses) are declared; msgspec skips every other key while decoding, so
+unused data is never materialized.
+"""
+
+import msgspec
+
+
+class CurrencyFormat(msgspec.Struct):
+    """Currency display settings of a budget."""
+
+    iso_code: str = ""
+    currency_symbol: str = ""
+
+
+class Budget(msgspec.Struct):
+    """Summary of a single budget."""
+
+    id: str
+    name: str
+    last_modified_on: str | None = None
+    currency_format: CurrencyFormat | None = None
+
+
+class Account(msgspec.Struct):
+    """A single account within a budget (balance in milliunits)."""
+
+    id: str
+    name: str = "Unknown"
+    type: str = "Unknown"
+    balance: int = 0
+    on_budget: bool = False
+    closed: bool = False
+    deleted: bool = False
+
+
+class _BudgetsData(msgspec.Struct):
+    budgets: list[Budget]
+
+
+class BudgetsResponse(msgspec.Struct):
+    """Response envelope of GET /budgets."""
+
+    data: _BudgetsData
+
+
+class _AccountsData(msgspec.Struct):
+    accounts: list[Account]
+    server_knowledge: int | None = None
+
+
+class AccountsResponse(msgspec.Struct):
+    """Response envelope of GET /budgets/{budget_id}/accounts."""
+
+    data: _AccountsData
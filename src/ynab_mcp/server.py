@@ -1,13 +1,18 @@
 """YNAB MCP server implementation."""
 
+import importlib.util
 import logging
 import os
+from collections.abc import AsyncIterable, Iterable, Iterator
 from contextlib import asynccontextmanager
+from operator import attrgetter
 from typing import AsyncIterator, Literal
 
+import anyio
 import httpx
 from mcp.server.fastmcp import FastMCP
 from ynab_mcp.client import YNABClient
+from ynab_mcp.models import Account, Budget
 
 # Suppress noisy logs
 logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -44,141 +49,242 @@ async def lifespan(app) -> AsyncIterator[None]:
 mcp = FastMCP("ynab-mcp", lifespan=lifespan)
 
 
-def format_budgets(budgets: list[dict]) -> str:
-    """Format budget list as readable text.
+# Error messages for YNAB API status codes that mean the same thing everywhere
+_STATUS_MSG = {
+    401: "Error: Invalid YNAB API token. Please check your YNAB_API_TOKEN environment variable.",
+    429: "Error: YNAB API rate limit exceeded. Please try again later.",
+}
+
+
+def _format_http_error(e: httpx.HTTPStatusError, *, budget_id: str | None = None) -> str:
+    """Translate a YNAB API error response into a readable error message.
 
     Args:
-        budgets: List of budget dictionaries from YNAB API
+        e: The error raised by the YNAB client
+        budget_id: The budget the request was for, used to explain 404s
 
     Returns:
-        Formatted string representation of budgets
+        Error message string for LLM consumption
+    """
+    status_code = e.response.status_code
+    if message := _STATUS_MSG.get(status_code):
+        return message
+    if status_code == 404 and budget_id is not None:
+        return f"Error: Budget '{budget_id}' not found. Please check the budget ID."
+    return f"Error: YNAB API returned status code {status_code}"
+
+
+# Table headers shared by the formatters
+_BUDGETS_HEADER = "Name | ID | Modified | Currency"
+_ACCOUNTS_HEADER = "Name | Type | Balance | On Budget | Closed"
+_TX_HEADER = "Date | Payee | Category | Amount | Memo | Cleared | Approved"
+_CATEGORIES_HEADER = "Category Group | Category | Assigned | Activity | Available"
+
+# Account fields shown in the account table, in column order
+_ACCT_FIELDS = ("name", "type", "balance", "on_budget", "closed")
+_account_fields = attrgetter(*_ACCT_FIELDS)
+
+
+def format_milliunits(amount: int) -> str:
+    """Format a YNAB milliunit amount as currency.
+
+    YNAB stores amounts as integer milliunits (1000 milliunits = $1.00), so the
+    conversion is done with integer arithmetic rather than float division,
+    rounding half away from zero to whole cents.
+
+    Args:
+        amount: Amount in milliunits
+
+    Returns:
+        Formatted amount with explicit sign, e.g. "$1,234.56" or "-$12.35"
+    """
+    neg = amount < 0
+    dollars, milli = divmod((-amount if neg else amount) + 5, 1000)
+    return f"{'-$' if neg else '$'}{dollars:,}.{milli // 10:02d}"
+
+
+def iter_format_budgets(budgets: list[Budget]) -> Iterator[str]:
+    """Yield the lines of the budget table, header first.
+
+    Args:
+        budgets: List of budgets from YNAB API
+
+    Yields:
+        Header and one line per budget, or a single "not found" line
     """
     if not budgets:
-        return "No budgets found."
+        yield "No budgets found."
+        return
 
-    output = ["Name | ID | Modified | Currency"]
+    yield _BUDGETS_HEADER
 
     for budget in budgets:
-        parts = [
-            budget["name"],
-            budget["id"],
-            budget.get("last_modified_on", ""),
-        ]
-
-        if currency := budget.get("currency_format"):
-            symbol = currency.get("currency_symbol", "")
-            code = currency.get("iso_code", "")
-            parts.append(f"{symbol}{code}")
+        if currency := budget.currency_format:
+            currency_str = f"{currency.currency_symbol}{currency.iso_code}"
         else:
-            parts.append("")
+            currency_str = ""
 
-        output.append(" | ".join(parts))
+        yield f"{budget.name} | {budget.id} | {budget.last_modified_on or ''} | {currency_str}"
 
-    return "\n".join(output)
 
+def format_budgets(budgets: list[Budget]) -> str:
+    """Format budget list as readable text.
+
+    Args:
+        budgets: List of budgets from YNAB API
 
-def format_accounts(accounts: list[dict]) -> str:
+    Returns:
+        Formatted string representation of budgets
+    """
+    return "\n".join(iter_format_budgets(budgets))
+
+
+def iter_format_accounts(accounts: list[Account]) -> Iterator[str]:
+    """Yield the lines of the account table, header first.
+
+    Args:
+        accounts: List of accounts from YNAB API
+
+    Yields:
+        Header and one line per account, or a single "not found" line
+    """
+    if not accounts:
+        yield "No accounts found."
+        return
+
+    yield _ACCOUNTS_HEADER
+
+    for account in accounts:
+        name, type_, balance, on_budget, closed = _account_fields(account)
+        yield (
+            f"{name} | {type_} | {format_milliunits(balance)} | "
+            f"{'Yes' if on_budget else 'No'} | {'Yes' if closed else 'No'}"
+        )
+
+
+def format_accounts(accounts: list[Account]) -> str:
     """Format account list as readable text.
 
     Args:
-        accounts: List of account dictionaries from YNAB API
+        accounts: List of accounts from YNAB API
 
     Returns:
         Formatted string representation of accounts
     """
-    if not accounts:
-        return "No accounts found."
+    return "\n".join(iter_format_accounts(accounts))
 
-    output = ["Name | Type | Balance | On Budget | Closed"]
 
-    for account in accounts:
-        # Convert milliunits to currency (YNAB stores as milliunits: 1000 milliunits = $1.00)
-        balance = account.get("balance", 0) / 1000.0
+def _format_transaction_row(txn: dict) -> str:
+    """Format a single transaction as a table row."""
+    get = txn.get
+    return (
+        f"{get('date', 'Unknown')} | "
+        f"{get('payee_name') or get('payee_id', 'Unknown')} | "
+        f"{get('category_name') or get('category_id') or 'Uncategorized'} | "
+        f"{format_milliunits(get('amount', 0))} | "
+        f"{(get('memo') or '')[:30]} | "  # Truncate long memos
+        f"{get('cleared', 'uncleared')} | "
+        f"{'Yes' if get('approved', False) else 'No'}"
+    )
 
-        parts = [
-            account.get("name", "Unknown"),
-            account.get("type", "Unknown"),
-            f"${balance:,.2f}",
-            "Yes" if account.get("on_budget", False) else "No",
-            "Yes" if account.get("closed", False) else "No"
-        ]
 
-        output.append(" | ".join(parts))
+def iter_format_transactions(transactions: Iterable[dict]) -> Iterator[str]:
+    """Yield the lines of the transaction table, header first.
 
-    return "\n".join(output)
+    Any iterable of transactions (including a generator) can be passed
+    without materializing it first.
+
+    Args:
+        transactions: Iterable of transaction dictionaries from YNAB API
 
+    Yields:
+        Header and one line per transaction, or a single "not found" line
+    """
+    empty = True
+
+    for txn in transactions:
+        if empty:
+            yield _TX_HEADER
+            empty = False
+        yield _format_transaction_row(txn)
 
-def format_transactions(transactions: list[dict]) -> str:
-    """Format transaction list as readable text.
+    if empty:
+        yield "No transactions found."
+
+
+async def aiter_format_transactions(transactions: AsyncIterable[dict]) -> AsyncIterator[str]:
+    """Asynchronously yield the lines of the transaction table, header first.
+
+    Counterpart of iter_format_transactions for streamed sources such as
+    YNABClient.iter_transactions, so each transaction can be formatted and
+    discarded as soon as it is parsed.
 
     Args:
-        transactions: List of transaction dictionaries from YNAB API
+        transactions: Async iterable of transaction dictionaries from YNAB API
 
-    Returns:
-        Formatted string representation of transactions
+    Yields:
+        Header and one line per transaction, or a single "not found" line
     """
-    if not transactions:
-        return "No transactions found."
+    empty = True
 
-    output = ["Date | Payee | Category | Amount | Memo | Cleared | Approved"]
+    async for txn in transactions:
+        if empty:
+            yield _TX_HEADER
+            empty = False
+        yield _format_transaction_row(txn)
 
-    for txn in transactions:
-        # Convert milliunits to currency (YNAB: 1000 milliunits = $1.00)
-        amount = txn.get("amount", 0) / 1000.0
+    if empty:
+        yield "No transactions found."
 
-        # Format with explicit sign for clarity
-        amount_str = f"${amount:,.2f}" if amount >= 0 else f"-${abs(amount):,.2f}"
 
-        parts = [
-            txn.get("date", "Unknown"),
-            txn.get("payee_name") or txn.get("payee_id", "Unknown"),
-            txn.get("category_name") or txn.get("category_id") or "Uncategorized",
-            amount_str,
-            (txn.get("memo") or "")[:30],  # Truncate long memos
-            txn.get("cleared", "uncleared"),
-            "Yes" if txn.get("approved", False) else "No"
-        ]
+def format_transactions(transactions: Iterable[dict]) -> str:
+    """Format transactions as readable text.
 
-        output.append(" | ".join(parts))
+    Args:
+        transactions: Iterable of transaction dictionaries from YNAB API
 
-    return "\n".join(output)
+    Returns:
+        Formatted string representation of transactions
+    """
+    return "\n".join(iter_format_transactions(transactions))
 
 
-def format_categories(categories: list[dict]) -> str:
-    """Format category list as readable text.
+def iter_format_categories(categories: list[dict]) -> Iterator[str]:
+    """Yield the lines of the category table, header first.
 
     Args:
         categories: List of category dictionaries from YNAB API
 
-    Returns:
-        Formatted string representation of categories
+    Yields:
+        Header and one line per category, or a single "not found" line
     """
     if not categories:
-        return "No categories found."
+        yield "No categories found."
+        return
 
-    output = ["Category Group | Category | Assigned | Activity | Available"]
+    yield _CATEGORIES_HEADER
 
     for cat in categories:
-        # Convert milliunits to currency (YNAB: 1000 milliunits = $1.00)
-        budgeted = cat.get("budgeted", 0) / 1000.0
-        activity = cat.get("activity", 0) / 1000.0
-        balance = cat.get("balance", 0) / 1000.0
+        get = cat.get
+        yield (
+            f"{get('category_group_name') or 'Unknown'} | "
+            f"{get('name') or 'Unknown'} | "
+            f"{format_milliunits(get('budgeted') or 0)} | "
+            f"{format_milliunits(get('activity') or 0)} | "
+            f"{format_milliunits(get('balance') or 0)}"
+        )
 
-        # Format amounts with explicit sign for clarity
-        def fmt_amount(amt: float) -> str:
-            return f"${amt:,.2f}" if amt >= 0 else f"-${abs(amt):,.2f}"
 
-        parts = [
-            cat.get("category_group_name", "Unknown"),
-            cat.get("name", "Unknown"),
-            fmt_amount(budgeted),
-            fmt_amount(activity),
-            fmt_amount(balance),
-        ]
+def format_categories(categories: list[dict]) -> str:
+    """Format category list as readable text.
 
-        output.append(" | ".join(parts))
+    Args:
+        categories: List of category dictionaries from YNAB API
 
-    return "\n".join(output)
+    Returns:
+        Formatted string representation of categories
+    """
+    return "\n".join(iter_format_categories(categories))
 
 
 @mcp.resource("ynab://budgets")
@@ -198,13 +304,7 @@ async def get_budgets() -> str:
         budgets = await ynab_client.get_budgets()
         return format_budgets(budgets)
     except httpx.HTTPStatusError as e:
-        status_code = e.response.status_code
-        if status_code == 401:
-            return "Error: Invalid YNAB API token. Please check your YNAB_API_TOKEN environment variable."
-        elif status_code == 429:
-            return "Error: YNAB API rate limit exceeded. Please try again later."
-        else:
-            return f"Error: YNAB API returned status code {status_code}"
+        return _format_http_error(e)
     except httpx.RequestError as e:
         return f"Error: Failed to connect to YNAB API - {str(e)}"
     except Exception as e:
@@ -228,15 +328,62 @@ async def get_accounts(budget_id: str) -> str:
         accounts = await ynab_client.get_accounts(budget_id)
         return format_accounts(accounts)
     except httpx.HTTPStatusError as e:
-        status_code = e.response.status_code
-        if status_code == 401:
-            return "Error: Invalid YNAB API token. Please check your YNAB_API_TOKEN environment variable."
-        elif status_code == 404:
-            return f"Error: Budget '{budget_id}' not found. Please check the budget ID."
-        elif status_code == 429:
-            return "Error: YNAB API rate limit exceeded. Please try again later."
+        return _format_http_error(e, budget_id=budget_id)
+    except httpx.RequestError as e:
+        return f"Error: Failed to connect to YNAB API - {str(e)}"
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+@mcp.resource("ynab://accounts/all")
+async def get_all_accounts() -> str:
+    """List the accounts of every YNAB budget for the user.
+
+    Returns:
+        Formatted string containing one account table per budget
+    """
+    if ynab_client is None:
+        return "Error: YNAB API client not initialized"
+
+    try:
+        results = await ynab_client.get_all_accounts()
+        if not results:
+            return "No budgets found."
+        return "\n\n".join(
+            f"{budget.name} ({budget.id})\n{format_accounts(accounts)}"
+            for budget, accounts in results
+        )
+    except httpx.HTTPStatusError as e:
+        return _format_http_error(e)
+    except httpx.RequestError as e:
+        return f"Error: Failed to connect to YNAB API - {str(e)}"
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+@mcp.resource("ynab://budgets/{budget_id}/overview")
+async def get_budget_overview(budget_id: str) -> str:
+    """Show a YNAB budget's summary together with its accounts.
+
+    Args:
+        budget_id: The ID of the budget to get the overview for
+
+    Returns:
+        Formatted string containing budget and account information
+    """
+    if ynab_client is None:
+        return "Error: YNAB API client not initialized"
+
+    try:
+        budget, accounts = await ynab_client.get_budget_overview(budget_id)
+        if budget is not None:
+            summary = format_budgets([budget])
         else:
-            return f"Error: YNAB API returned status code {status_code}"
+            # Aliases such as "last-used" are not in the budget list
+            summary = f"Budget '{budget_id}' summary unavailable."
+        return f"{summary}\n\n{format_accounts(accounts)}"
+    except httpx.HTTPStatusError as e:
+        return _format_http_error(e, budget_id=budget_id)
     except httpx.RequestError as e:
         return f"Error: Failed to connect to YNAB API - {str(e)}"
     except Exception as e:
@@ -260,15 +407,7 @@ async def get_categories(budget_id: str) -> str:
         categories = await ynab_client.get_categories(budget_id)
         return format_categories(categories)
     except httpx.HTTPStatusError as e:
-        status_code = e.response.status_code
-        if status_code == 401:
-            return "Error: Invalid YNAB API token. Please check your YNAB_API_TOKEN environment variable."
-        elif status_code == 404:
-            return f"Error: Budget '{budget_id}' not found. Please check the budget ID."
-        elif status_code == 429:
-            return "Error: YNAB API rate limit exceeded. Please try again later."
-        else:
-            return f"Error: YNAB API returned status code {status_code}"
+        return _format_http_error(e, budget_id=budget_id)
     except httpx.RequestError as e:
         return f"Error: Failed to connect to YNAB API - {str(e)}"
     except Exception as e:
@@ -301,24 +440,25 @@ async def get_transactions(
         return f"Error: transaction_type must be one of {valid_types} or None"
 
     try:
-        transactions = await ynab_client.get_transactions(budget_id, transaction_type)
-        return format_transactions(transactions)
+        # Format each transaction as it is parsed off the wire rather than
+        # holding the whole list of transaction dicts in memory
+        transactions = ynab_client.iter_transactions(budget_id, transaction_type)
+        return "\n".join([line async for line in aiter_format_transactions(transactions)])
     except httpx.HTTPStatusError as e:
-        status_code = e.response.status_code
-        if status_code == 401:
-            return "Error: Invalid YNAB API token. Please check your YNAB_API_TOKEN environment variable."
-        elif status_code == 404:
-            return f"Error: Budget '{budget_id}' not found. Please check the budget ID."
-        elif status_code == 429:
-            return "Error: YNAB API rate limit exceeded. Please try again later."
-        else:
-            return f"Error: YNAB API returned status code {status_code}"
+        return _format_http_error(e, budget_id=budget_id)
     except httpx.RequestError as e:
         return f"Error: Failed to connect to YNAB API - {str(e)}"
     except Exception as e:
         return f"Error: {str(e)}"
 
 
+def main() -> None:
+    """Run the server using stdio transport, on uvloop where available."""
+    # Not available on Windows; fall back to the default event loop there
+    use_uvloop = importlib.util.find_spec("uvloop") is not None
+
+    anyio.run(mcp.run_stdio_async, backend_options={"use_uvloop": use_uvloop})
+
+
 if __name__ == "__main__":
-    # Run the server using stdio transport
-    mcp.run()
+    main()
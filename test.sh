@@ -15,10 +15,10 @@ if [ -z "${YNAB_API_TOKEN:-}" ]; then
     exit 1
 fi
 
-# Run pytest with parallel execution
-# Each test manages its own server subprocess, so parallel execution is safe
+# Run pytest (parallel execution is configured in pytest.ini)
+# Each xdist worker starts one shared server subprocess for its tests
 echo "Running integration tests..."
-if uv run pytest tests/ -n auto --tb=short -v; then
+if uv run pytest tests/; then
     echo "✓ All tests passed"
     exit 0
 else
@@ -1,30 +1,129 @@
 """Pytest configuration for YNAB MCP tests."""
 
+import asyncio
+import functools
 import os
+import re
 from contextlib import asynccontextmanager
 
 import pytest
+import pytest_asyncio
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
 
-def pytest_configure(config):
-    """Validate environment before running tests."""
-    if not os.environ.get("YNAB_API_TOKEN"):
-        pytest.exit(
-            "YNAB_API_TOKEN not set. "
-            "Get your token from: https://app.ynab.com/settings/developer",
-            returncode=1
-        )
+# Where recorded YNAB API responses live unless YNAB_CASSETTE_DIR says otherwise
+CASSETTE_DIR = os.path.join(os.path.dirname(__file__), "cassettes")
+# Cassette file written by recording_server.py
+CASSETTE_NAME = "ynab.yaml"
 
 
-@pytest.fixture
-def server_params():
+def pytest_addoption(parser):
+    """Add the option controlling YNAB API response recording."""
+    parser.addoption(
+        "--record-mode",
+        choices=["once", "new_episodes", "none", "all"],
+        default=None,
+        help=(
+            "Record YNAB API responses to cassettes and replay them on later "
+            "runs (vcrpy record mode; 'none' replays only). Also enabled by "
+            "setting YNAB_CASSETTE_DIR."
+        ),
+    )
+
+
+def _record_mode(config):
+    """Return the cassette record mode of the run, or None without cassettes."""
+    record_mode = config.getoption("record_mode")
+    if record_mode is None and "YNAB_CASSETTE_DIR" in os.environ:
+        return "once"
+    return record_mode
+
+
+def _replay_only(record_mode):
+    """Whether cassettes are only replayed, so the run never contacts YNAB.
+
+    "once" records only while the cassette file does not exist yet.
+    """
+    if record_mode == "once":
+        cassette_dir = os.environ.get("YNAB_CASSETTE_DIR", CASSETTE_DIR)
+        return os.path.exists(os.path.join(cassette_dir, CASSETTE_NAME))
+    return record_mode == "none"
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config):
+    """Record cassettes from a single process.
+
+    Each xdist worker runs its own server, and every one of them would
+    overwrite the shared cassette with just its own requests on exit.
+    Replaying only reads the cassette, so it still runs in parallel.
+    """
+    record_mode = _record_mode(config)
+    if record_mode is not None and not _replay_only(record_mode):
+        config.option.numprocesses = 0
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip integration tests up front when there is no way to reach YNAB.
+
+    Without a token (and without a cassette to replay) every integration
+    test would fail while starting the server, or record YNAB's 401s into a
+    new cassette, so mark them all skipped with a single environment check
+    instead. Tests against the mocked API still run.
+    """
+    if os.environ.get("YNAB_API_TOKEN") or _replay_only(_record_mode(config)):
+        return
+
+    skip = pytest.mark.skip(
+        reason="YNAB_API_TOKEN not set. "
+        "Get your token from: https://app.ynab.com/settings/developer"
+    )
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_server_config(record_mode):
+    """Build the server command line and environment from os.environ.
+
+    When cassettes are enabled the server is wrapped by recording_server.py.
+    Recording needs a real token, but replaying an existing cassette does not.
+
+    Args:
+        record_mode: Cassette record mode, or None without cassettes
+
+    Returns:
+        Dict of command, args and env for StdioServerParameters
+    """
+    env = os.environ.copy()
+
+    if record_mode is None:
+        return {
+            "command": "uv",
+            "args": ["run", "python", "-m", "ynab_mcp.server"],
+            "env": env,
+        }
+
+    env.setdefault("YNAB_CASSETTE_DIR", CASSETTE_DIR)
+    env["YNAB_RECORD_MODE"] = record_mode
+    if _replay_only(record_mode):
+        # Replayed requests never reach YNAB, so any token will do
+        env.setdefault("YNAB_API_TOKEN", "replay")
+
+    return {
+        "command": "uv",
+        "args": ["run", "python", os.path.join(os.path.dirname(__file__), "recording_server.py")],
+        "env": env,
+    }
+
+
+@pytest.fixture(scope="session")
+def server_params(pytestconfig):
     """Provide server parameters for tests."""
     return StdioServerParameters(
-        command="uv",
-        args=["run", "python", "-m", "ynab_mcp.server"],
-        env=os.environ.copy(),
+        **_load_server_config(_record_mode(pytestconfig))
     )
 
 
@@ -42,9 +141,104 @@ async def get_mcp_session(server_params):
             yield session
 
 
+@pytest_asyncio.fixture(scope="session")
+async def mcp_session(server_params):
+    """Provide one MCP session shared by every test in the run.
+
+    The server subprocess and its YNAB client (with its warm connection
+    pool) are started once instead of once per test.
+    """
+    # anyio requires the session's cancel scopes to be exited by the task that
+    # entered them, but pytest-asyncio runs fixture setup and teardown in
+    # separate tasks, so keep the session open inside a dedicated task.
+    ready = asyncio.get_running_loop().create_future()
+    done = asyncio.Event()
+
+    async def hold_session():
+        async with get_mcp_session(server_params) as session:
+            ready.set_result(session)
+            await done.wait()
+
+    task = asyncio.create_task(hold_session())
+    await asyncio.wait([ready, task], return_when=asyncio.FIRST_COMPLETED)
+    if not ready.done():
+        task.result()  # Re-raise whatever stopped the session from starting
+
+    session = ready.result()
+    # Look up the budget to test against while pytest moves on to the first
+    # test, so the budgets round trip overlaps with the rest of the setup
+    budget_task = _budget_id_task(session)
+
+    yield session
+
+    # Stop the lookup if no test asked for budget_id, or else collect how it
+    # ended so a failed lookup is not reported as never retrieved
+    if not budget_task.cancel():
+        budget_task.exception()
+    done.set()
+    await task
+
+
+@functools.lru_cache(maxsize=128)
+def _read_resource_task(session, uri):
+    """Start reading a resource, memoized per session and URI.
+
+    Caches the task rather than the coroutine so the result can be awaited
+    any number of times, and concurrent reads of the same URI share a request.
+    """
+    return asyncio.ensure_future(session.read_resource(uri))
+
+
+async def cached_read_resource(session, uri):
+    """Read a resource, reusing the result of earlier reads of the same URI.
+
+    Resource text is stable for the duration of a test run, so repeat reads
+    are served from memory. URIs containing "invalid-" are never cached so
+    error paths always hit the server.
+    """
+    if "invalid-" in uri:
+        return await session.read_resource(uri)
+    return await _read_resource_task(session, uri)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _clear_resource_cache():
+    """Drop cached resource reads at the end of the test session."""
+    yield
+    _read_resource_task.cache_clear()
+    _budget_id_task.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
+def table_or_empty_pattern(header, *empty_msgs):
+    """Compile a pattern matching a table header or any of its empty messages.
+
+    Compiled once per distinct header and messages, however many tests use it.
+    """
+    return re.compile("|".join(map(re.escape, (header, *empty_msgs))))
+
+
+def assert_table_or_empty(text, header, *empty_msgs):
+    """Assert that text is non-empty and shows a table or an empty message.
+
+    Args:
+        text: Resource or tool output to check
+        header: Header line of the table, e.g. "Name | ID"
+        *empty_msgs: Messages shown instead of the table when there is no data
+    """
+    assert text and table_or_empty_pattern(header, *empty_msgs).search(text), text
+
+
 async def get_budget_id(session):
-    """Helper to get first available budget ID from session."""
-    result = await session.read_resource("ynab://budgets")
+    """Helper to get the budget ID to test against.
+
+    Uses YNAB_BUDGET_ID if set, otherwise the first available budget. Tests
+    take the budget_id fixture instead, which resolves it once per session.
+    """
+    if budget_id := os.environ.get("YNAB_BUDGET_ID"):
+        return budget_id
+
+    result = await cached_read_resource(session, "ynab://budgets")
     text = result.contents[0].text
 
     lines = text.strip().split("\n")
@@ -52,3 +246,19 @@ async def get_budget_id(session):
         pytest.skip("No budgets available for testing")
 
     return lines[1].split(" | ")[1]
+
+
+@functools.lru_cache(maxsize=1)
+def _budget_id_task(session):
+    """Start resolving the budget ID for a session, at most once."""
+    return asyncio.ensure_future(get_budget_id(session))
+
+
+@pytest_asyncio.fixture(scope="session")
+async def budget_id(mcp_session):
+    """Provide the budget ID to test against.
+
+    The lookup is started by mcp_session as soon as the session is up, so
+    this usually just collects an already finished result.
+    """
+    return await _budget_id_task(mcp_session)
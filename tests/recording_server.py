@@ -0,0 +1,43 @@
+"""Run the YNAB MCP server with its YNAB API traffic recorded to cassettes.
+
+The test suite launches this instead of ``python -m ynab_mcp.server`` when
+cassettes are enabled (see ``server_params`` in conftest.py). On the first
+run the real YNAB responses are written to YNAB_CASSETTE_DIR; later runs
+replay them from disk without touching the network.
+
+Requests are matched on method, URL path and query string, so budget IDs
+and the transaction_type filter each get their own recorded response.
+
+Whichever xdist worker replays a request, it must find the same response,
+so the requests sent must not depend on what the server fetched earlier:
+account delta requests are switched off, and 304 Not Modified answers to
+conditional GETs are not recorded (replay serves the full 200 instead).
+"""
+
+import os
+
+import vcr
+
+from ynab_mcp.client import YNABClient
+from ynab_mcp.server import main
+
+
+def _skip_not_modified(response):
+    """Keep 304 responses out of the cassette."""
+    return None if response["status"]["code"] == 304 else response
+
+
+if __name__ == "__main__":
+    YNABClient.delta_requests = False
+
+    recorder = vcr.VCR(
+        cassette_library_dir=os.environ["YNAB_CASSETTE_DIR"],
+        record_mode=os.environ.get("YNAB_RECORD_MODE", "once"),
+        match_on=["method", "scheme", "host", "path", "query"],
+        # Never write the API token to disk
+        filter_headers=["authorization"],
+        before_record_response=_skip_not_modified,
+    )
+    # The same read may legitimately happen several times per run
+    with recorder.use_cassette("ynab.yaml", allow_playback_repeats=True):
+        main()
@@ -0,0 +1,16 @@
+"""Tests for the ynab://accounts/all resource."""
+
+import pytest
+
+from conftest import assert_table_or_empty, cached_read_resource
+
+
+@pytest.mark.integration
+async def test_all_accounts_resource(mcp_session):
+    """Test the ynab://accounts/all resource."""
+    result = await cached_read_resource(mcp_session, "ynab://accounts/all")
+    accounts_text = result.contents[0].text
+
+    assert_table_or_empty(
+        accounts_text, "Name | Type | Balance", "No accounts found", "No budgets found"
+    )
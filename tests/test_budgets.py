@@ -2,17 +2,13 @@
 
 import pytest
 
-from conftest import get_mcp_session
+from conftest import assert_table_or_empty, cached_read_resource
 
 
 @pytest.mark.integration
-async def test_budgets_resource(server_params):
+async def test_budgets_resource(mcp_session):
     """Test the ynab://budgets resource."""
-    async with get_mcp_session(server_params) as session:
-        result = await session.read_resource("ynab://budgets")
-        budgets_text = result.contents[0].text
+    result = await cached_read_resource(mcp_session, "ynab://budgets")
+    budgets_text = result.contents[0].text
 
-        assert budgets_text and (
-            "Name | ID" in budgets_text or
-            "No budgets found" in budgets_text
-        )
+    assert_table_or_empty(budgets_text, "Name | ID", "No budgets found")
@@ -0,0 +1,208 @@
+"""Error-path and caching tests against a mocked YNAB API.
+
+These call the MCP resource and tool handlers directly, with the YNAB
+client's HTTP transport replaced by canned responses, so they need neither
+an API token nor network access:
+
+    uv run pytest -m "not integration"
+"""
+
+import httpx
+import pytest
+
+from ynab_mcp import server
+from ynab_mcp.client import YNABClient
+
+
+@pytest.fixture
+async def mock_api(monkeypatch):
+    """Install a YNAB client whose API requests are answered by a handler.
+
+    Usage:
+        client = await mock_api(lambda request: httpx.Response(200, json=...))
+        text = await server.get_budgets()
+    """
+    clients = []
+
+    async def install(handler):
+        client = YNABClient("test-token")
+        await client.client.aclose()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(server, "ynab_client", client)
+        clients.append(client)
+        return client
+
+    yield install
+
+    for client in clients:
+        await client.close()
+
+
+@pytest.fixture
+def mock_ynab(mock_api):
+    """Install a YNAB client whose API answers every request with a status code.
+
+    Usage:
+        await mock_ynab(404)
+        text = await server.get_categories("invalid-id-12345")
+    """
+    async def install(status_code):
+        def handler(request):
+            return httpx.Response(
+                status_code,
+                json={"error": {"id": str(status_code), "name": "error", "detail": "error"}},
+            )
+
+        return await mock_api(handler)
+
+    return install
+
+
+def _account(account_id, balance=0, deleted=False):
+    """Build an account as returned by the YNAB API."""
+    return {
+        "id": account_id,
+        "name": f"Account {account_id}",
+        "type": "checking",
+        "balance": balance,
+        "on_budget": True,
+        "closed": False,
+        "deleted": deleted,
+    }
+
+
+async def test_categories_invalid_budget(mock_ynab):
+    """Test the categories resource with a budget_id the API doesn't know."""
+    await mock_ynab(404)
+
+    error_text = await server.get_categories("invalid-id-12345")
+
+    assert error_text == "Error: Budget 'invalid-id-12345' not found. Please check the budget ID."
+
+
+async def test_overview_invalid_budget(mock_ynab):
+    """Test the overview resource with a budget_id the API doesn't know."""
+    await mock_ynab(404)
+
+    error_text = await server.get_budget_overview("invalid-id-12345")
+
+    assert error_text == "Error: Budget 'invalid-id-12345' not found. Please check the budget ID."
+
+
+async def test_overview_budget_not_listed(mock_api):
+    """Test the overview resource for a budget ID missing from the budget list."""
+    def handler(request):
+        if request.url.path.endswith("/accounts"):
+            return httpx.Response(200, json={"data": {"accounts": [_account("a", 1000)]}})
+        return httpx.Response(200, json={"data": {"budgets": [{"id": "other", "name": "Other"}]}})
+
+    await mock_api(handler)
+
+    overview_text = await server.get_budget_overview("last-used")
+
+    summary, accounts_text = overview_text.split("\n\n")
+    assert summary == "Budget 'last-used' summary unavailable."
+    assert accounts_text.startswith("Name | Type | Balance")
+
+
+async def test_transactions_invalid_budget(mock_ynab):
+    """Test the get_transactions tool with a budget_id the API doesn't know."""
+    await mock_ynab(404)
+
+    error_text = await server.get_transactions("invalid-budget-12345")
+
+    assert error_text == "Error: Budget 'invalid-budget-12345' not found. Please check the budget ID."
+
+
+@pytest.mark.smoke
+async def test_transactions_invalid_type(mock_ynab):
+    """Test that an invalid transaction_type is rejected before calling the API."""
+    await mock_ynab(500)
+
+    error_text = await server.get_transactions("budget-id", "invalid_type")
+
+    assert error_text.startswith("Error: transaction_type must be one of")
+
+
+async def test_invalid_token(mock_ynab):
+    """Test the error reported when the API rejects the token."""
+    await mock_ynab(401)
+
+    error_text = await server.get_budgets()
+
+    assert "Invalid YNAB API token" in error_text
+
+
+async def test_rate_limited(mock_ynab):
+    """Test the error reported when the API rate limit is hit."""
+    await mock_ynab(429)
+
+    error_text = await server.get_budgets()
+
+    assert "rate limit exceeded" in error_text
+
+
+async def test_accounts_delta(mock_api):
+    """Test that later account reads request and merge only the changes."""
+    requests = []
+    responses = iter([
+        {"accounts": [_account("a", 1000), _account("b")], "server_knowledge": 10},
+        {
+            "accounts": [_account("b", deleted=True), _account("a", 2500), _account("c")],
+            "server_knowledge": 11,
+        },
+        {"accounts": [], "server_knowledge": 11},
+    ])
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"data": next(responses)})
+
+    client = await mock_api(handler)
+
+    first = await client.get_accounts("budget-id")
+    second = await client.get_accounts("budget-id")
+    third = await client.get_accounts("budget-id")
+
+    assert [r.url.params.get("last_knowledge_of_server") for r in requests] == [None, "10", "11"]
+    assert [(a.id, a.balance) for a in first] == [("a", 1000), ("b", 0)]
+    assert [(a.id, a.balance) for a in second] == [("a", 2500), ("c", 0)]
+    assert third == second
+
+
+async def test_accounts_empty_not_remembered(mock_api):
+    """Test that an empty account list is not used as a delta baseline."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"data": {"accounts": [], "server_knowledge": 5}})
+
+    client = await mock_api(handler)
+
+    assert await client.get_accounts("budget-id") == []
+    assert await client.get_accounts("budget-id") == []
+
+    assert all("last_knowledge_of_server" not in r.url.params for r in requests)
+
+
+async def test_budgets_not_modified(mock_api):
+    """Test that a 304 reuses the budgets parsed from the previous response."""
+    requests = []
+    budgets = {"budgets": [{"id": "budget-id", "name": "My Budget"}]}
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"data": budgets}, headers={"ETag": '"v1"'})
+
+    client = await mock_api(handler)
+
+    first = await client.get_budgets()
+    client._cache.clear()  # Expire the TTL cache so the API is asked again
+    second = await client.get_budgets()
+
+    assert [r.headers.get("if-none-match") for r in requests] == [None, '"v1"']
+    assert second is first
+    assert [b.name for b in second] == ["My Budget"]
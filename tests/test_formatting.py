@@ -0,0 +1,20 @@
+"""Tests for the currency formatting of YNAB milliunit amounts."""
+
+import pytest
+
+from ynab_mcp.server import format_milliunits
+
+
+@pytest.mark.parametrize("amount,expected", [
+    (0, "$0.00"),
+    # Half a cent rounds away from zero
+    (5, "$0.01"),
+    (-5, "-$0.01"),
+    (995, "$1.00"),
+    # Negative amounts put the sign before the currency symbol
+    (-12345, "-$12.35"),
+    (123456789, "$123,456.79"),
+], ids=["zero", "half_cent", "negative_half_cent", "round_up_to_dollar", "negative", "thousands"])
+def test_format_milliunits(amount, expected):
+    """Test formatting milliunits as dollars and cents."""
+    assert format_milliunits(amount) == expected
@@ -0,0 +1,18 @@
+"""Tests for the ynab://budgets/{budget_id}/overview resource."""
+
+import pytest
+
+from conftest import assert_table_or_empty, cached_read_resource
+
+
+@pytest.mark.integration
+async def test_overview_resource_valid(mcp_session, budget_id):
+    """Test the overview resource with valid budget_id."""
+    result = await cached_read_resource(
+        mcp_session, f"ynab://budgets/{budget_id}/overview"
+    )
+    overview_text = result.contents[0].text
+
+    assert budget_id in overview_text
+    assert_table_or_empty(overview_text, "Name | Type | Balance", "No accounts found")
+
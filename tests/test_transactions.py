@@ -1,92 +1,50 @@
 """Tests for the get_transactions MCP tool."""
 
-import pytest
-
-from conftest import get_budget_id, get_mcp_session
-
-
-@pytest.mark.integration
-async def test_transactions_all(server_params):
-    """Test getting all transactions for a budget."""
-    async with get_mcp_session(server_params) as session:
-        budget_id = await get_budget_id(session)
-
-        result = await session.call_tool(
-            "get_transactions",
-            arguments={"budget_id": budget_id}
-        )
-        transactions_text = result.content[0].text
-
-        assert transactions_text and (
-            "Date | Payee | Category" in transactions_text or
-            "No transactions found" in transactions_text
-        )
-
-
-@pytest.mark.integration
-async def test_transactions_uncategorized(server_params):
-    """Test getting uncategorized transactions."""
-    async with get_mcp_session(server_params) as session:
-        budget_id = await get_budget_id(session)
+import asyncio
+import re
 
-        result = await session.call_tool(
-            "get_transactions",
-            arguments={
-                "budget_id": budget_id,
-                "transaction_type": "uncategorized"
-            }
-        )
-        uncategorized_text = result.content[0].text
+import pytest
 
-        # Validate we got a response (may be empty if no uncategorized transactions)
-        assert uncategorized_text
+from conftest import table_or_empty_pattern
 
 
 @pytest.mark.integration
-async def test_transactions_unapproved(server_params):
-    """Test getting unapproved transactions."""
-    async with get_mcp_session(server_params) as session:
-        budget_id = await get_budget_id(session)
-
-        result = await session.call_tool(
-            "get_transactions",
-            arguments={
-                "budget_id": budget_id,
-                "transaction_type": "unapproved"
-            }
-        )
-        unapproved_text = result.content[0].text
-
-        # Validate we got a response (may be empty if no unapproved transactions)
-        assert unapproved_text
+@pytest.mark.parametrize("transaction_type,expected", [
+    # All transactions: a table, or the empty message
+    (None, table_or_empty_pattern("Date | Payee | Category", "No transactions found")),
+    # Filtered: any response is fine (may be empty if nothing matches)
+    ("uncategorized", None),
+    ("unapproved", None),
+    # Invalid filter: rejected with an error
+    ("invalid_type", re.compile("Error")),
+], ids=["all", "uncategorized", "unapproved", "invalid_type"])
+async def test_transactions(mcp_session, budget_id, transaction_type, expected):
+    """Test getting transactions with each transaction_type filter."""
+    arguments = {"budget_id": budget_id}
+    if transaction_type is not None:
+        arguments["transaction_type"] = transaction_type
+
+    result = await mcp_session.call_tool("get_transactions", arguments=arguments)
+    transactions_text = result.content[0].text
+
+    assert transactions_text
+    assert expected is None or expected.search(transactions_text)
 
 
 @pytest.mark.integration
-async def test_transactions_invalid_type(server_params):
-    """Test error handling for invalid transaction_type."""
-    async with get_mcp_session(server_params) as session:
-        budget_id = await get_budget_id(session)
+async def test_transactions_matrix(mcp_session, budget_id):
+    """Test all transaction_type filters with concurrent tool calls."""
+    transaction_types = ("uncategorized", "unapproved")
 
-        result = await session.call_tool(
+    results = await asyncio.gather(*(
+        mcp_session.call_tool(
             "get_transactions",
-            arguments={
-                "budget_id": budget_id,
-                "transaction_type": "invalid_type"
-            }
+            arguments={"budget_id": budget_id, "transaction_type": transaction_type}
         )
-        invalid_text = result.content[0].text
+        for transaction_type in transaction_types
+    ))
 
-        assert "Error" in invalid_text
-
-
-@pytest.mark.integration
-async def test_transactions_invalid_budget(server_params):
-    """Test error handling for invalid budget_id."""
-    async with get_mcp_session(server_params) as session:
-        result = await session.call_tool(
-            "get_transactions",
-            arguments={"budget_id": "invalid-budget-12345"}
-        )
-        error_text = result.content[0].text
-
-        assert "Error" in error_text or "not found" in error_text.lower()
+    for transaction_type, result in zip(transaction_types, results):
+        transactions_text = result.content[0].text
+        assert transactions_text, transaction_type
+        assert not transactions_text.startswith("Error"), transactions_text